@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import sqlite3
+from scipy.sparse import csr_matrix
+
+# Configurações do banco de dados
+db_path = './scrapy_project.db'  # Substitua pelo caminho do seu banco de dados
+table_name = 'items'  # Nome da tabela que contém as colunas tokenizadas
+columns_to_score = ['preferencias_tokens', 'melhorias_tokens', 'problemas_resolvidos_beneficios_tokens']
+# Colunas geradas pelo tokenizer.py
+
+# Configurações do léxico de sentimentos
+lexicon_path = './lexico_sentimento.csv'  # Arquivo CSV com as colunas 'termo' e 'peso' (entre -1 e 1)
+negadores = {'não', 'nem', 'nunca', 'jamais', 'sem'}  # Termos que invertem a polaridade dos seguintes
+janela_negacao = 3  # Quantidade de tokens após um negador que têm a polaridade invertida
+limiar_sentimento = 0.1  # Pontuação mínima (em módulo) para classificar como Positivo ou Negativo
+chunk_size = 50000  # Quantidade de linhas processadas por lote
+
+# Carregar o léxico e montar o vocabulário (termo -> índice) e o vetor de pesos.
+# Cada termo ocupa duas posições: a forma normal (i) e a forma negada (i + n_termos), com peso invertido.
+lexico = pd.read_csv(lexicon_path)
+lexico['termo'] = lexico['termo'].str.strip().str.lower()
+lexico = lexico.drop_duplicates('termo', keep='last').reset_index(drop=True)
+n_termos = len(lexico)
+vocabulario = pd.Series(np.arange(n_termos), index=lexico['termo'])
+pesos = np.concatenate([lexico['peso'].to_numpy(dtype=float), -lexico['peso'].to_numpy(dtype=float)])
+
+
+def matriz_lexico(textos):
+    """
+    Converte uma série de textos tokenizados numa matriz esparsa de contagens de termos do léxico.
+
+    Args:
+        textos (pd.Series): Textos com os tokens separados por espaço.
+
+    Returns:
+        csr_matrix: Matriz (linhas x 2 * n_termos) com as contagens das formas normal e negada de cada termo.
+    """
+    textos = textos.reset_index(drop=True)
+    tokens = textos.fillna('').str.split().explode().dropna()
+
+    # Mapear os tokens para os índices do vocabulário, descartando os que não estão no léxico
+    indices = tokens.map(vocabulario)
+    no_lexico = indices.notna()
+
+    # Posição de cada token dentro da sua linha, do último negador e do último termo do léxico antes dele.
+    # A negação só inverte o primeiro termo do léxico que aparece dentro da janela após o negador.
+    posicao = tokens.groupby(level=0).cumcount()
+    ultimo_negador = posicao.where(tokens.isin(negadores)).groupby(level=0).ffill()
+    lexico_anterior = posicao.where(no_lexico).groupby(level=0).shift().groupby(level=0).ffill()
+    negado = (posicao - ultimo_negador).between(1, janela_negacao) & ~(lexico_anterior > ultimo_negador)
+    linhas = tokens.index[no_lexico].to_numpy()
+    colunas = indices[no_lexico].to_numpy(dtype=np.int64) + negado[no_lexico].to_numpy() * n_termos
+
+    return csr_matrix(
+        (np.ones(len(linhas)), (linhas, colunas)),
+        shape=(len(textos), 2 * n_termos)
+    )
+
+
+def categorize_sentiment(scores):
+    """
+    Converte as pontuações de texto em sentimentos.
+
+    Args:
+        scores (np.ndarray): Pontuações entre -1 e 1.
+
+    Returns:
+        np.ndarray: 'Positivo', 'Neutro' ou 'Negativo' para cada pontuação.
+    """
+    return np.select(
+        [scores >= limiar_sentimento, scores <= -limiar_sentimento],
+        ['Positivo', 'Negativo'],
+        default='Neutro'
+    )
+
+
+def score_chunk(df):
+    """
+    Calcula as pontuações de sentimento de um lote de linhas.
+
+    Args:
+        df (pd.DataFrame): Lote com a coluna 'id' e as colunas tokenizadas.
+
+    Returns:
+        pd.DataFrame: Pontuação de cada coluna, pontuação combinada e sentimento do texto por 'id'.
+    """
+    resultado = pd.DataFrame({'id': df['id'].to_numpy()})
+    soma_total = np.zeros(len(df))
+    ocorrencias_total = np.zeros(len(df))
+
+    for col in columns_to_score:
+        matriz = matriz_lexico(df[col])
+        soma = matriz @ pesos
+        ocorrencias = np.asarray(matriz.sum(axis=1)).ravel()
+        # Média dos pesos dos termos encontrados; 0 quando nenhum termo do léxico aparece
+        resultado[f"{col}_score"] = np.divide(soma, ocorrencias, out=np.zeros(len(df)), where=ocorrencias > 0)
+        soma_total += soma
+        ocorrencias_total += ocorrencias
+
+    resultado['score_texto'] = np.divide(
+        soma_total, ocorrencias_total, out=np.zeros(len(df)), where=ocorrencias_total > 0)
+    resultado['sentimento_texto'] = categorize_sentiment(resultado['score_texto'].to_numpy())
+    return resultado
+
+
+# Conectar ao banco de dados
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+# Adicionar as novas colunas ao banco de dados
+score_columns = [f"{col}_score" for col in columns_to_score] + ['score_texto']
+for col in score_columns:
+    try:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {col} REAL")
+    except sqlite3.OperationalError:
+        # A coluna já existe
+        pass
+
+try:
+    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN sentimento_texto TEXT")
+except sqlite3.OperationalError:
+    # A coluna já existe
+    pass
+
+# Processar a tabela em lotes ordenados por 'id', para não carregar milhões de linhas na memória
+set_clause = ', '.join([f"{col} = ?" for col in score_columns + ['sentimento_texto']])
+query = f"SELECT id, {', '.join(columns_to_score)} FROM {table_name} WHERE id > ? ORDER BY id LIMIT ?"
+ultimo_id = -1
+while True:
+    df = pd.read_sql_query(query, conn, params=(ultimo_id, chunk_size))
+    if df.empty:
+        break
+
+    resultado = score_chunk(df)
+    valores = resultado[score_columns + ['sentimento_texto', 'id']].itertuples(index=False, name=None)
+    cursor.executemany(f"UPDATE {table_name} SET {set_clause} WHERE id = ?", list(valores))
+    conn.commit()
+
+    ultimo_id = int(df['id'].iloc[-1])
+
+# Fechar a conexão com o banco de dados
+conn.close()
+
+
+# Consulta para verificar as novas colunas ao lado de 'media', limitada às primeiras linhas da tabela
+conn = sqlite3.connect(db_path)
+query_result = pd.read_sql_query(f"""
+    SELECT id, media, sentimento_estrelas, {', '.join(score_columns)}, sentimento_texto
+    FROM {table_name}
+    LIMIT 5
+""", conn)
+conn.close()
+
+print(query_result)
+
+print(
+    "Análise de sentimentos do texto concluída e atualizada no banco de dados, com as pontuações de cada coluna, "
+    "'score_texto' e 'sentimento_texto' ao lado de 'media'."
+)
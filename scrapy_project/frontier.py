@@ -0,0 +1,208 @@
+# scrapy_project/frontier.py
+
+"""
+Módulo frontier.py
+Este módulo define a fronteira de coleta persistente do projeto Scrapy, compartilhada por vários processos do Spider.
+A fronteira guarda a fila de URLs das páginas de avaliações e o conjunto de 'fingerprints' das URLs já vistas,
+permitindo que a coleta seja distribuída entre processos e retomada após uma falha.
+## Objetivo
+O objetivo principal deste módulo é substituir a fila em memória do Scrapy por uma fila armazenada num banco de dados
+SQLite local. Cada processo reserva ('lease') um lote de URLs por um tempo limitado; se o processo cair antes de concluir
+a página, a reserva expira e a URL volta a ficar disponível para outro processo.
+
+## Componentes Importantes
+- **sqlite3**: Módulo da biblioteca padrão usado como 'backend' de referência da fronteira.
+- **fingerprint**: Função do Scrapy que gera o identificador canônico de uma requisição, usado para evitar URLs
+repetidas.
+
+## Estados de uma URL
+- **pendente**: Aguardando ser reservada por um processo. Após uma falha, a URL vai para o fim da fila e só pode ser
+reservada de novo depois de um atraso (guardado em `lease_expira`), que dobra a cada tentativa.
+- **em_andamento**: Reservada por um processo até o fim do 'lease'.
+- **concluido**: Página coletada com sucesso.
+- **falhou**: Página que excedeu o número máximo de tentativas.
+
+## Coleta Nova e Coleta Retomada
+Se ainda houver URLs pendentes ou em andamento, um novo processo retoma a coleta existente (após uma falha, ou para
+dividir o trabalho com os processos em execução). Se a coleta anterior terminou, ou se `reiniciar` for usado, a
+fronteira é esvaziada e semeada de novo com as URLs iniciais.
+
+## Notas
+- Todas as operações que alteram a fila usam transações `BEGIN IMMEDIATE`, de modo que dois processos nunca reservam
+a mesma URL ao mesmo tempo. As alterações de uma página são agrupadas numa única transação curta (`atualizar`), e a
+espera pela trava é limitada por `timeout` para não bloquear o reator do Scrapy.
+- O modo de 'journal' padrão é `DELETE`. O modo `WAL` é mais rápido, mas só funciona quando todos os processos estão
+na mesma máquina; ele não é suportado em sistemas de arquivos de rede.
+"""
+
+# Importação dos módulos da biblioteca padrão e da função de fingerprint do Scrapy
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import scrapy
+from scrapy.utils.request import fingerprint
+
+
+class SQLiteFrontier(object):
+    """Fronteira de coleta persistente armazenada num banco de dados SQLite."""
+
+    def __init__(self, db_path, lease_segundos=300, max_tentativas=3, timeout=1.0, journal_mode='DELETE',
+                 atraso_segundos=30):
+        """
+        Abre a conexão com o banco de dados da fronteira e cria a tabela se não existir.
+
+        Args:
+            db_path (str): Caminho do arquivo SQLite da fronteira.
+            lease_segundos (int): Tempo em segundos que uma URL fica reservada para um processo.
+            max_tentativas (int): Número máximo de reservas de uma URL antes de ela ser marcada como falha.
+            timeout (float): Tempo máximo em segundos de espera pela trava do banco de dados.
+            journal_mode (str): Modo de 'journal' do SQLite ('DELETE' ou, numa única máquina, 'WAL').
+            atraso_segundos (int): Atraso em segundos antes de uma URL que falhou ser tentada de novo; dobra a cada
+                tentativa.
+        """
+        self.lease_segundos = lease_segundos
+        self.max_tentativas = max_tentativas
+        self.atraso_segundos = atraso_segundos
+        # As transações são controladas manualmente para permitir o uso de BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+        self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                fingerprint TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expira REAL,
+                adicionado_em REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_frontier_status ON frontier (status, lease_expira)")
+
+    @contextmanager
+    def _transacao(self):
+        """Executa um bloco dentro de uma transação com trava de escrita, desfazendo-a em caso de erro."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        try:
+            self.conn.execute("COMMIT")
+        except sqlite3.OperationalError:
+            # O COMMIT pode falhar se outra conexão mantiver uma trava de leitura; a transação não pode ficar aberta
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def fingerprint_url(url):
+        """
+        Gera o fingerprint canônico de uma URL.
+
+        Args:
+            url (str): A URL da página.
+
+        Returns:
+            str: O fingerprint em hexadecimal.
+        """
+        return fingerprint(scrapy.Request(url)).hex()
+
+    def iniciar(self, start_urls, reiniciar=False):
+        """
+        Retoma a coleta em andamento ou, se ela terminou, começa uma nova a partir das URLs iniciais.
+
+        Args:
+            start_urls (list): As URLs iniciais do Spider.
+            reiniciar (bool): Se True, descarta a coleta em andamento e começa uma nova.
+
+        Returns:
+            bool: True se uma nova coleta começou, False se a coleta está sendo retomada.
+        """
+        with self._transacao() as conn:
+            if not reiniciar and not self._finalizado(conn):
+                return False
+            conn.execute("DELETE FROM frontier")
+            self._inserir(conn, start_urls)
+        return True
+
+    def atualizar(self, worker, limite, concluidas=(), novas=(), falhas=()):
+        """
+        Registra o resultado das páginas coletadas e reserva o próximo lote de URLs, numa única transação.
+
+        Args:
+            worker (str): O identificador do processo que reserva as URLs.
+            limite (int): O número máximo de URLs reservadas.
+            concluidas (list): URLs coletadas com sucesso. Assim como em `falhas`, o resultado só é gravado se a URL
+                ainda estiver reservada para este processo, para não sobrescrever o de quem a reservou depois.
+            novas (list): URLs descobertas, ignoradas se já foram vistas.
+            falhas (list): URLs que falharam e devem voltar para o fim da fila após um atraso, ou ser marcadas como
+                falha se excederam o número máximo de tentativas.
+
+        Returns:
+            list: As URLs reservadas, na ordem em que foram adicionadas.
+        """
+        agora = time.time()
+        with self._transacao() as conn:
+            self._inserir(conn, novas)
+            conn.executemany(
+                "UPDATE frontier SET status = 'concluido', worker = NULL, lease_expira = NULL "
+                "WHERE fingerprint = ? AND worker = ? AND status = 'em_andamento'",
+                [(self.fingerprint_url(url), worker) for url in concluidas]
+            )
+            # Na fila, lease_expira indica a partir de quando a URL pode ser reservada de novo
+            conn.executemany(
+                "UPDATE frontier SET status = CASE WHEN tentativas >= ? THEN 'falhou' ELSE 'pendente' END, "
+                "worker = NULL, lease_expira = ? + ? * (1 << (tentativas - 1)), adicionado_em = ? "
+                "WHERE fingerprint = ? AND worker = ? AND status = 'em_andamento'",
+                [(self.max_tentativas, agora, self.atraso_segundos, agora, self.fingerprint_url(url), worker)
+                 for url in falhas]
+            )
+            # Reservas expiradas que já esgotaram as tentativas não voltam para a fila
+            conn.execute(
+                "UPDATE frontier SET status = 'falhou', worker = NULL, lease_expira = NULL "
+                "WHERE status = 'em_andamento' AND lease_expira < ? AND tentativas >= ?",
+                (agora, self.max_tentativas)
+            )
+            rows = conn.execute(
+                "SELECT fingerprint, url FROM frontier "
+                "WHERE (status = 'pendente' AND (lease_expira IS NULL OR lease_expira <= ?)) "
+                "OR (status = 'em_andamento' AND lease_expira < ?) "
+                "ORDER BY adicionado_em, rowid LIMIT ?",
+                (agora, agora, limite)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE frontier SET status = 'em_andamento', worker = ?, lease_expira = ?, "
+                "tentativas = tentativas + 1 WHERE fingerprint = ?",
+                [(worker, agora + self.lease_segundos, fp) for fp, _ in rows]
+            )
+        return [url for _, url in rows]
+
+    def _inserir(self, conn, urls):
+        """Insere URLs pendentes, usando o fingerprint como chave do conjunto de URLs vistas."""
+        agora = time.time()
+        conn.executemany(
+            "INSERT OR IGNORE INTO frontier (fingerprint, url, adicionado_em) VALUES (?, ?, ?)",
+            [(self.fingerprint_url(url), url, agora) for url in urls]
+        )
+
+    def finalizado(self):
+        """
+        Verifica se não há mais URLs pendentes ou em andamento em nenhum processo.
+
+        Returns:
+            bool: True se a coleta terminou.
+        """
+        return self._finalizado(self.conn)
+
+    def _finalizado(self, conn):
+        """Consulta se a fronteira não tem URLs pendentes ou em andamento."""
+        row = conn.execute(
+            "SELECT 1 FROM frontier WHERE status IN ('pendente', 'em_andamento') LIMIT 1"
+        ).fetchone()
+        return row is None
+
+    def close(self):
+        """Fecha a conexão com o banco de dados da fronteira."""
+        self.conn.close()
@@ -16,6 +16,7 @@
 
 # Importação de componentes da biblioteca SQLAlchemy
 from sqlalchemy import create_engine, Column, Integer, String, Text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 
 
@@ -24,25 +25,37 @@ from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
 
 
-def db_connect():
+def db_connect(database_url='sqlite:///scrapy_project.db'):
     """
     Estabelece a conexão com o banco de dados.
 
+    Args:
+        database_url (str): A URL do banco de dados no formato do SQLAlchemy.
+
     Retorna:
-        engine: Objeto de engine do SQLAlchemy conectado ao banco de dados SQLite.
+        engine: Objeto de engine do SQLAlchemy conectado ao banco de dados.
     """
-    return create_engine('sqlite:///scrapy_project.db', connect_args={'check_same_thread': False})
+    if not database_url.startswith('sqlite'):
+        return create_engine(database_url)
+    # O timeout faz com que processos concorrentes aguardem a trava de escrita do SQLite em vez de falharem
+    return create_engine(database_url, connect_args={'check_same_thread': False, 'timeout': 30})
 
 
-def create_table(engine):
+def create_table(engine, recriar=True):
     """
     Cria a tabela no banco de dados. Se a tabela já existir, ela será recriada.
 
     Args:
         engine: O objeto de engine do SQLAlchemy.
+        recriar (bool): Se False, mantém a tabela existente (usado ao retomar uma coleta).
     """
-    Base.metadata.drop_all(engine)  # Limpar a tabela existente
-    Base.metadata.create_all(engine)  # Criar a tabela com a nova estrutura
+    if recriar:
+        Base.metadata.drop_all(engine)  # Limpar a tabela existente
+    try:
+        Base.metadata.create_all(engine)  # Criar a tabela com a nova estrutura
+    except OperationalError:
+        # Outro processo criou a tabela ao mesmo tempo; a nova verificação a encontra e não tenta criá-la de novo
+        Base.metadata.create_all(engine)
 
 
 class Item(Base):
@@ -52,6 +65,7 @@ class Item(Base):
     __tablename__ = "items"
 
     id = Column(Integer, primary_key=True)  # Coluna de ID primária
+    review_key = Column(String(40), unique=True)  # Chave da avaliação, evita duplicatas entre processos
     title = Column(Text)  # Coluna de título
     reviewer_name = Column(String(100))  # Coluna de nome do avaliador
     reviewer_position = Column(String(100))  # Coluna de posição do avaliador
@@ -21,12 +21,18 @@ que facilita a interação entre os objetos Python e os bancos de dados relacion
 
 Esta classe define o pipeline que processa cada item coletado e o armazena no banco de dados.
 
-#### `__init__(self)`
+#### `__init__(self, recriar_tabela=True, database_url=None)`
 
-- Inicializa a conexão com o banco de dados usando a função `db_connect`.
-- Cria a tabela no banco de dados caso ainda não exista, usando a função `create_table`.
+- Inicializa a conexão com o banco de dados usando a função `db_connect` e a URL definida em `DATABASE_URL`.
+- Cria a tabela no banco de dados caso ainda não exista, usando a função `create_table`. A tabela só é recriada quando
+uma nova coleta começa; ao retomar uma coleta a partir da fronteira persistente, os itens já gravados são mantidos.
 - Configura uma fábrica de sessões (`sessionmaker`) ligada ao engine do banco de dados.
 
+#### `from_crawler(cls, crawler)`
+
+- Cria o pipeline a partir do Crawler, usando o atributo `nova_coleta` do Spider para decidir se a tabela é recriada
+e a configuração `DATABASE_URL` para escolher o banco de dados.
+
 #### `process_item(self, item, spider)`
 
 Este método processa cada item coletado pelo Spider e o armazena no banco de dados.
@@ -43,6 +49,7 @@ Este método processa cada item coletado pelo Spider e o armazena no banco de da
   - Cria uma nova sessão de banco de dados.
   - Cria uma instância do modelo `Item` e preenche os campos com os valores extraídos.
   - Adiciona o item à sessão e comita a transação.
+  - Se a avaliação já foi gravada por outro processo (mesma `review_key`), desfaz a transação e descarta o item.
   - Em caso de erro, desfaz a transação e gera uma exceção.
   - Fecha a sessão ao final do processo.
 
@@ -84,6 +91,10 @@ processadas de maneira eficiente e sem erros.
 
 
 # Importação de componentes do SQLAlchemy e definições do módulo models
+import hashlib
+
+from scrapy.exceptions import DropItem
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from scrapy_project.models import Item, db_connect, create_table
 
@@ -91,15 +102,31 @@ from scrapy_project.models import Item, db_connect, create_table
 class ScrapyProjectPipeline(object):
     """Pipeline para processar e armazenar itens coletados pelo Spider."""
 
-    def __init__(self):
+    def __init__(self, recriar_tabela=True, database_url=None):
         """Inicializa a conexão com o banco de dados e cria a tabela se não existir."""
         # Conecta ao banco de dados
-        engine = db_connect()
+        engine = db_connect(database_url) if database_url else db_connect()
         # Cria a tabela no banco de dados, se ainda não existir
-        create_table(engine)
+        create_table(engine, recriar=recriar_tabela)
         # Cria uma fábrica de sessões ligadas ao engine
         self.Session = sessionmaker(bind=engine)
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        """
+        Cria o pipeline, mantendo os itens já gravados quando o Spider retoma uma coleta.
+
+        Args:
+            crawler (scrapy.crawler.Crawler): O Crawler que executa o Spider.
+
+        Returns:
+            ScrapyProjectPipeline: A instância do pipeline.
+        """
+        return cls(
+            recriar_tabela=getattr(crawler.spider, 'nova_coleta', True),
+            database_url=crawler.settings.get('DATABASE_URL')
+        )
+
     def process_item(self, item, spider):
         """
         Processa e armazena cada item no banco de dados.
@@ -117,6 +144,7 @@ class ScrapyProjectPipeline(object):
         scraped_item = Item()
 
         # Preenche os campos do item com os valores extraídos
+        scraped_item.review_key = self.review_key(item)
         scraped_item.title = item.get('title', 'No title')
         scraped_item.reviewer_name = item.get('reviewer_name', 'No name')
         scraped_item.reviewer_position = item.get('reviewer_position', 'No position')
@@ -144,6 +172,10 @@ class ScrapyProjectPipeline(object):
             # Adiciona o item à sessão e comita a transação
             session.add(scraped_item)
             session.commit()
+        except IntegrityError:
+            # A avaliação já foi gravada, por exemplo ao coletar de novo uma página cuja reserva expirou
+            session.rollback()
+            raise DropItem(f"Avaliação duplicada: {scraped_item.review_key}")
         except Exception as e:
             # Em caso de erro, desfaz a transação
             session.rollback()
@@ -153,6 +185,19 @@ class ScrapyProjectPipeline(object):
             session.close()
         return item
 
+    def review_key(self, item):
+        """
+        Gera a chave que identifica uma avaliação, independente da página ou do processo que a coletou.
+
+        Args:
+            item (dict): O item coletado pelo Spider.
+
+        Returns:
+            str: O hash SHA-1 do título, revisor, empresa e data de publicação da avaliação.
+        """
+        campos = [item.get(campo, '') for campo in ('title', 'reviewer_name', 'reviewer_company', 'published_date')]
+        return hashlib.sha1('|'.join(campos).encode('utf-8')).hexdigest()
+
     def convert_grade(self, grade_str):
         """
         Converte uma string de porcentagem em uma nota de 1 a 5 estrelas.
@@ -25,3 +25,32 @@ USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
 
 # Define um atraso entre os downloads para evitar sobrecarga no servidor
 DOWNLOAD_DELAY = 2
+
+# URL (no formato do SQLAlchemy) do banco de dados onde os itens são armazenados.
+# Para processos em mais de uma máquina, use um banco de dados compartilhado por todas elas.
+DATABASE_URL = 'sqlite:///scrapy_project.db'
+
+# Caminho do banco de dados SQLite da fronteira de coleta compartilhada entre os processos do Spider
+FRONTIER_DB_PATH = './frontier.db'
+
+# Tempo, em segundos, que uma URL fica reservada para um processo antes de voltar para a fila
+FRONTIER_LEASE = 300
+
+# Número máximo de tentativas de coleta de uma URL antes de ela ser marcada como falha
+FRONTIER_MAX_TENTATIVAS = 3
+
+# Atraso, em segundos, antes de uma URL que falhou ser tentada de novo; o atraso dobra a cada tentativa
+FRONTIER_RETRY_DELAY = 30
+
+# Quantidade de URLs reservadas por vez por cada processo
+FRONTIER_BATCH_SIZE = 4
+
+# Tempo máximo, em segundos, de espera pela trava da fronteira; acima disso a atualização é adiada
+FRONTIER_TIMEOUT = 1
+
+# Modo de 'journal' do SQLite da fronteira. 'WAL' é mais rápido, mas só pode ser usado se todos os processos
+# estiverem na mesma máquina; em sistemas de arquivos de rede, mantenha 'DELETE'
+FRONTIER_JOURNAL_MODE = 'DELETE'
+
+# Descarta a coleta em andamento e começa uma nova (por exemplo, scrapy crawl ... -s FRONTIER_RESET=1)
+FRONTIER_RESET = False
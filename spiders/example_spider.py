@@ -23,13 +23,23 @@ O objetivo principal deste módulo é definir um Spider que navega por páginas
 - **URLs Iniciais**: `['https://www.b2bstack.com.br/product/astrea/avaliacoes']`
   - Define as URLs de onde o Spider começará a coleta de dados.
 ## Métodos Principais
+### `from_crawler(cls, crawler)`
+Cria o Spider e abre a fronteira de coleta persistente (`SQLiteFrontier`) configurada em `FRONTIER_DB_PATH`. Se a
+fronteira ainda tiver URLs pendentes ou em andamento, a coleta é retomada de onde parou, inclusive após uma falha;
+se a coleta anterior terminou, ou com `-s FRONTIER_RESET=1`, uma nova coleta começa a partir de `start_urls`. Vários
+processos podem compartilhar a mesma fronteira.
 ### `start_requests(self)`
-Este método inicializa as requisições HTTP para as URLs definidas em `start_urls`. Ele configura cabeçalhos
+Este método reserva um lote de URLs da fronteira e envia as requisições HTTP. Ele configura cabeçalhos
 personalizados para evitar bloqueios automáticos por parte do servidor e envia as requisições.
 - **Cabeçalhos Personalizados**: Inclui informações de user-agent para emular um navegador e evitar detecção como um bot.
+### `spider_idle(self)`
+Quando o Spider fica ocioso, reserva novas URLs da fronteira e mantém o Spider aberto enquanto outros processos ainda
+tiverem páginas em andamento. Os resultados das páginas são gravados na fronteira junto com a reserva seguinte, numa
+única transação; se a fronteira estiver ocupada, eles são enviados na próxima tentativa.
 ### `parse(self, response)`
 Método de callback principal que processa a resposta das requisições. Ele extrai os elementos de interesse das páginas
-de avaliação e cria instâncias de `ScrapyProjectItem` com os dados extraídos.
+de avaliação (`parse_reviews`) e cria instâncias de `ScrapyProjectItem` com os dados extraídos. Se a extração falhar,
+a página volta para a fila da fronteira.
 
 - **Extração de Dados**:
   - **Título da Avaliação**: Extraído do elemento `<h3>`.
@@ -39,8 +49,9 @@ de avaliação e cria instâncias de `ScrapyProjectItem` com os dados extraídos
   - **Notas de Avaliação**: Coletadas e armazenadas como um dicionário.
   - **Perguntas e Respostas**: Coletadas e armazenadas como um dicionário.
 
-- **Navegação de Páginas**: Verifica a existência de um link para a próxima página e, se presente, envia uma nova
-requisição para continuar a coleta de dados.
+- **Navegação de Páginas**: Verifica a existência de um link para a próxima página e, se presente, adiciona à
+fronteira todas as páginas até a última numerada na paginação (`pagination_urls`), marca a página atual como
+concluída e reserva as próximas URLs, permitindo que vários processos coletem páginas diferentes ao mesmo tempo.
 
 ### Exemplo de Uso
 
@@ -75,8 +86,16 @@ e a precisão dos dados coletados.
 # extensão do projeto, permitindo a adaptação ou a adição de novos campos com mínima alteração no código
 # existente do spider.
 
-# Importação do módulo scrapy e de itens definidos no projeto
+# Importação do módulo scrapy, de itens e da fronteira definidos no projeto
+import os
+import socket
+import sqlite3
+
 import scrapy
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from w3lib.url import add_or_replace_parameter, url_query_parameter
+from scrapy_project.frontier import SQLiteFrontier
 from scrapy_project.items import ScrapyProjectItem
 
 
@@ -89,20 +108,143 @@ class ExampleSpider(scrapy.Spider):
     allowed_domains = ['www.b2bstack.com.br']
     # URLs iniciais para começar a coleta
     start_urls = ['https://www.b2bstack.com.br/product/astrea/avaliacoes']
+    # Cabeçalhos personalizados para as requisições
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                      'AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/58.0.3029.110 '
+                      'Safari/537.3'
+    }
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        """Cria o Spider e abre a fronteira de coleta compartilhada, retomando a coleta ou começando uma nova."""
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.frontier = SQLiteFrontier(
+            crawler.settings.get('FRONTIER_DB_PATH'),
+            lease_segundos=crawler.settings.getint('FRONTIER_LEASE'),
+            max_tentativas=crawler.settings.getint('FRONTIER_MAX_TENTATIVAS'),
+            timeout=crawler.settings.getfloat('FRONTIER_TIMEOUT'),
+            journal_mode=crawler.settings.get('FRONTIER_JOURNAL_MODE'),
+            atraso_segundos=crawler.settings.getint('FRONTIER_RETRY_DELAY')
+        )
+        # Identificador do processo usado nas reservas da fronteira
+        spider.worker = f"{socket.gethostname()}:{os.getpid()}"
+        # Resultados das páginas ainda não gravados na fronteira, enviados na próxima atualização
+        spider.frontier_pendente = {'concluidas': [], 'novas': [], 'falhas': []}
+        # Quantidade de URLs reservadas por este processo e ainda não processadas
+        spider.frontier_em_andamento = 0
+        # Indica ao pipeline se a coleta é nova ou se está sendo retomada
+        spider.nova_coleta = spider.frontier.iniciar(
+            spider.start_urls, reiniciar=crawler.settings.getbool('FRONTIER_RESET'))
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(spider.spider_closed, signal=signals.spider_closed)
+        return spider
 
     def start_requests(self):
         """Define cookies e cabeçalhos personalizados para as requisições iniciais."""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                          'AppleWebKit/537.36 (KHTML, like Gecko) '
-                          'Chrome/58.0.3029.110 '
-                          'Safari/537.3'
-        }
-        # Faz requisições para cada URL inicial com cabeçalhos personalizados
-        for url in self.start_urls:
-            yield scrapy.Request(url, headers=headers)
+        # Faz requisições para as URLs reservadas na fronteira com cabeçalhos personalizados
+        yield from self.frontier_requests()
+
+    def frontier_requests(self, limite=None):
+        """Grava os resultados pendentes na fronteira, reserva um lote de URLs e cria as requisições correspondentes."""
+        if limite is None:
+            # Cada processo mantém no máximo FRONTIER_BATCH_SIZE URLs reservadas, deixando as demais para os outros
+            limite = max(0, self.settings.getint('FRONTIER_BATCH_SIZE') - self.frontier_em_andamento)
+        try:
+            urls = self.frontier.atualizar(self.worker, limite, **self.frontier_pendente)
+        except sqlite3.OperationalError as e:
+            # A fronteira está ocupada por outro processo; os resultados são enviados na próxima atualização
+            self.logger.warning(f"Atualização da fronteira adiada: {e}")
+            return
+        for pendentes in self.frontier_pendente.values():
+            pendentes.clear()
+
+        self.frontier_em_andamento += len(urls)
+        for url in urls:
+            # A fronteira já descarta URLs repetidas, e uma URL devolvida à fila precisa poder ser requisitada de novo
+            yield scrapy.Request(url, headers=self.headers, callback=self.parse, errback=self.errback,
+                                 meta={'frontier_url': url}, dont_filter=True)
+
+    def spider_idle(self):
+        """Reserva novas URLs quando o Spider fica ocioso e o mantém aberto até a fronteira terminar."""
+        requests = list(self.frontier_requests())
+        for request in requests:
+            self.crawler.engine.crawl(request)
+        if requests or any(self.frontier_pendente.values()):
+            raise DontCloseSpider
+        # Outros processos podem adicionar novas páginas enquanto ainda tiverem URLs em andamento
+        try:
+            finalizado = self.frontier.finalizado()
+        except sqlite3.OperationalError:
+            finalizado = False
+        if not finalizado:
+            raise DontCloseSpider
+
+    def spider_closed(self, spider):
+        """Grava os resultados pendentes e fecha a conexão com a fronteira."""
+        list(self.frontier_requests(limite=0))
+        self.frontier.close()
+
+    def errback(self, failure):
+        """Devolve à fronteira a URL cuja requisição falhou, para que seja tentada de novo."""
+        url = failure.request.meta['frontier_url']
+        self.logger.warning(f"Falha ao coletar {url}: {failure.value}")
+        self.frontier_pendente['falhas'].append(url)
+        self.frontier_em_andamento -= 1
+        yield from self.frontier_requests()
 
     def parse(self, response):
+        """Extrai as avaliações e as páginas seguintes, e registra o resultado da página na fronteira."""
+        url = response.meta['frontier_url']
+        try:
+            # As avaliações são extraídas antes de serem enviadas, para que um erro não deixe a página pela metade
+            items = list(self.parse_reviews(response))
+            pages = self.pagination_urls(response)
+        except Exception:
+            self.logger.exception(f"Erro ao extrair as avaliações de {url}")
+            self.frontier_pendente['falhas'].append(url)
+        else:
+            yield from items
+            self.frontier_pendente['novas'].extend(pages)
+            self.frontier_pendente['concluidas'].append(url)
+        self.frontier_em_andamento -= 1
+
+        # Reserva as próximas URLs da fronteira
+        yield from self.frontier_requests()
+
+    def pagination_urls(self, response):
+        """
+        Extrai as URLs das páginas seguintes a partir da paginação.
+
+        Além do link da próxima página, gera todas as páginas até a última numerada na paginação (parâmetro 'page'),
+        para que vários processos possam coletá-las ao mesmo tempo.
+
+        Args:
+            response (scrapy.http.Response): A resposta da página de avaliações.
+
+        Returns:
+            list: As URLs das páginas seguintes.
+        """
+        next_page = response.xpath('//a[@class="next_page"]/@href').get()
+        if not next_page:
+            return []
+        next_url = response.urljoin(next_page)
+
+        # Números de página presentes nos links da paginação, incluindo o da última página
+        numeros = [
+            int(numero) for numero in (
+                url_query_parameter(response.urljoin(href), 'page')
+                for href in response.xpath('//a[@class="next_page"]/../a/@href').getall()
+            ) if numero and numero.isdigit()
+        ]
+        if not numeros:
+            return [next_url]
+        return [next_url] + [
+            add_or_replace_parameter(next_url, 'page', str(numero)) for numero in range(2, max(numeros) + 1)
+        ]
+
+    def parse_reviews(self, response):
         """Extrai informações das avaliações da página de resposta."""
         # Seleciona todos os elementos de avaliação na página
         reviews = response.xpath('//div[@class="review"]')
@@ -154,8 +296,3 @@ class ExampleSpider(scrapy.Spider):
 
             # Envia o item para o pipeline
             yield scrapy_item
-
-        # Procura pelo link da próxima página e faz uma nova requisição se encontrado
-        next_page = response.xpath('//a[@class="next_page"]/@href').get()
-        if next_page:
-            yield scrapy.Request(url=response.urljoin(next_page), callback=self.parse)
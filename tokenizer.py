@@ -12,8 +12,8 @@ nlp = spacy.load('pt_core_news_sm')
 nltk.download('stopwords')
 nltk.download('punkt')
 
-# Lista de stopwords em português
-stop_words = set(stopwords.words('portuguese'))
+# Lista de stopwords em português, mantendo os termos de negação usados na análise de sentimentos do texto
+stop_words = set(stopwords.words('portuguese')) - {'não', 'nem', 'nunca', 'jamais', 'sem'}
 
 # Configurações do banco de dados
 db_path = './scrapy_project.db'  # Substitua pelo caminho do seu banco de dados